@@ -1,8 +1,13 @@
+import asyncio
+from collections import deque
+from functools import lru_cache
 from ipaddress import ip_address
-from logging import DEBUG, Handler, Logger, LogRecord
-from typing import Any, Dict, List, Optional
+from logging import DEBUG, INFO, Handler, Logger, LogRecord
+from time import monotonic
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
 
-from gradio import Blocks, Button, Dropdown, Markdown, Row, Textbox
+from gradio import Blocks, Button, Dropdown, Markdown, Row, Textbox, update
+from pydantic import IPvAnyAddress
 
 from fungi.client.client import Client
 from fungi.models.node import Node
@@ -10,6 +15,21 @@ from fungi.utils.constants import SERVER_URL
 from fungi.utils.logger import get_logger
 
 
+@lru_cache(maxsize=1024)
+def _parse_ipport(target: str) -> Tuple[IPvAnyAddress, int]:
+    """
+    Parse an "ip:port" dropdown value into an address and port.
+
+    Cached because the same selection is re-parsed on every connect and
+    chat-message click.
+
+    :param str target: The target in "ip:port" format.
+    :return Tuple[IPvAnyAddress, int]: The parsed IP address and port.
+    """
+    ip, _, port = target.partition(":")
+    return ip_address(ip), int(port)
+
+
 class LogHandler(Handler):
     """
     Custom logging handler to update the app's log panel.
@@ -23,11 +43,13 @@ class LogHandler(Handler):
         """
         Emit a log record.
 
+        Level filtering is handled by the handler's own level (set to INFO
+        when the handler is wired up), so no manual check is needed here.
+
         :param LogRecord record: The log record to emit.
         """
-        if record.levelno > 10:  # Filter out DEBUG logs (level 10)
-            log_entry = self.format(record)
-            self.callback(log_entry)
+        log_entry = self.format(record)
+        self.callback(log_entry)
 
 
 class P2PNetworkLauncher:
@@ -35,26 +57,73 @@ class P2PNetworkLauncher:
     A class to manage the P2P Network Launcher application.
     """
 
+    NODES_CACHE_TTL: float = 3.0
+    MAX_LOG_LINES: int = 500
+
     def __init__(self) -> None:
         """
         Initialize the P2P Network Launcher.
         """
         self._logger: Logger = get_logger(name="P2P_Launcher", level=DEBUG)
         client_logger = get_logger(name="P2P_Client", level=DEBUG)
-        client_logger.addHandler(LogHandler(self._update_log))
+        self._wire_log_handler(client_logger)
         self._client: Client = Client(server_url=SERVER_URL, logger=client_logger)
         self._connection_status: str = "off"
-        self._log: str = ""
-        self._chat_history: str = ""
+        self._log_buf: deque = deque(maxlen=self.MAX_LOG_LINES)
+        self._chat_buf: deque = deque(maxlen=self.MAX_LOG_LINES)
         self._connected_node: Optional[str] = None
+        self._nodes_cache: Tuple[Optional[List[Node]], float] = (None, 0.0)
+        self._nodes_inflight: Optional[asyncio.Task] = None
+        self._node_choices: List[str] = []
+        self._node_choices_sig: Optional[Tuple[Tuple[str, Optional[int]], ...]] = None
+
+    def _wire_log_handler(self, client_logger: Logger) -> None:
+        """
+        Attach the UI log handler to the client logger exactly once.
+
+        `logging.getLogger` returns the same logger across launcher
+        instances, so blindly adding a handler would stack them up and emit
+        every record multiple times. Reuse an existing handler and just
+        repoint its callback at this launcher.
+
+        :param Logger client_logger: The client logger to wire up.
+        """
+        for handler in client_logger.handlers:
+            if isinstance(handler, LogHandler):
+                handler.callback = self._update_log
+                return
+        handler = LogHandler(self._update_log)
+        handler.setLevel(INFO)
+        client_logger.addHandler(handler)
+
+    @property
+    def _log(self) -> str:
+        """
+        Render the bounded log buffer as a single string.
+
+        :return str: The log panel content.
+        """
+        return "\n".join(self._log_buf)
+
+    @property
+    def _chat_history(self) -> str:
+        """
+        Render the bounded chat buffer as a single string.
+
+        :return str: The chat log content.
+        """
+        return "\n".join(self._chat_buf)
 
     def _update_log(self, message: str) -> None:
         """
         Update the log panel with a new message.
 
+        The buffer keeps only the most recent lines, so appending stays O(1)
+        instead of growing an unbounded string over a long session.
+
         :param str message: The message to add to the log panel.
         """
-        self._log += f"{message}\n"
+        self._log_buf.append(message)
 
     def _add_chat_message(self, message: str) -> None:
         """
@@ -62,47 +131,104 @@ class P2PNetworkLauncher:
 
         :param str message: The message to add to the chat log.
         """
-        self._chat_history += f"{message}\n"
+        self._chat_buf.append(message)
 
-    async def _join_network(self) -> List[Any]:
+    def _pending_ui(self) -> List[Any]:
         """
-        Join the P2P network.
+        Build an interim UI update that only refreshes the log panel.
 
-        :return List[Any]: A list containing the updated UI components.
+        Yielded while a network operation is in flight so the browser
+        receives the latest log lines without waiting for the full result.
+
+        :return List[Any]: The log content plus no-op updates for the other components.
+        """
+        return [self._log, update(), update(), update(), update(), update(), update()]
+
+    async def _join_network(self) -> AsyncIterator[List[Any]]:
         """
+        Join the P2P network, streaming log updates while it runs.
+
+        :yield List[Any]: The updated UI components.
+        """
+        yield self._pending_ui()
         result: Dict[str, Any] = await self._client.join_network()
         self._connection_status = "on" if result["status"] == "success" else "off"
-        return await self._update_ui()
-
-    async def _leave_network(self) -> List[Any]:
+        if "nodes" in result:
+            # The join response piggy-backs the node list, so seed the cache
+            # instead of issuing a second round-trip to the server.
+            self._nodes_cache = (result["nodes"], monotonic())
+        else:
+            self._invalidate_nodes_cache()
+        yield await self._update_ui()
+
+    async def _leave_network(self) -> AsyncIterator[List[Any]]:
         """
-        Leave the P2P network.
+        Leave the P2P network, streaming log updates while it runs.
 
-        :return List[Any]: A list containing the updated UI components.
+        :yield List[Any]: The updated UI components.
         """
+        yield self._pending_ui()
         result: Dict[str, Any] = await self._client.leave_network()
         self._connection_status = "off" if result["status"] == "success" else self._connection_status
-        return await self._update_ui()
+        self._invalidate_nodes_cache()
+        yield await self._update_ui()
 
-    async def _update_current_nodes(self) -> List[Node]:
+    def _invalidate_nodes_cache(self) -> None:
+        """
+        Drop the cached node list so the next lookup hits the server.
+        """
+        self._nodes_cache = (None, 0.0)
+
+    async def _update_current_nodes(self, force: bool = False) -> List[Node]:
         """
         Update the list of current nodes in the network.
 
+        The result is cached for a few seconds so repeated UI callbacks
+        do not hammer the discovery server with redundant requests.
+
+        :param bool force: If True, bypass the cache and query the server.
         :return List[Node]: A list of current nodes.
         """
-        return await self._client.get_nodes()
+        cached_nodes, cached_at = self._nodes_cache
+        if not force and cached_nodes is not None and monotonic() - cached_at < self.NODES_CACHE_TTL:
+            return cached_nodes
+        if self._nodes_inflight is not None and not self._nodes_inflight.done():
+            # A fetch is already running: piggy-back on it instead of
+            # issuing a second concurrent request to the server.
+            return await asyncio.shield(self._nodes_inflight)
+        self._nodes_inflight = asyncio.ensure_future(self._client.get_nodes())
+        try:
+            nodes = await asyncio.shield(self._nodes_inflight)
+        finally:
+            self._nodes_inflight = None
+        self._nodes_cache = (nodes, monotonic())
+        return nodes
 
-    async def _connect_to_node(self, target_node: str) -> List[Any]:
+    async def _refresh_nodes(self) -> List[Any]:
         """
-        Connect to a specific node in the network.
+        Force a refresh of the node list and update the UI.
 
-        :param str target_node: The node to connect to (in "ip:port" format).
         :return List[Any]: A list containing the updated UI components.
         """
+        await self._update_current_nodes(force=True)
+        return await self._update_ui()
+
+    async def _connect_to_node(self, target_node: str) -> AsyncIterator[List[Any]]:
+        """
+        Connect to a specific node in the network, streaming log updates.
+
+        :param str target_node: The node to connect to (in "ip:port" format).
+        :yield List[Any]: The updated UI components.
+        """
+        if target_node == self._connected_node and self._connection_status == "on":
+            # Already connected to this peer: skip the redundant handshake.
+            yield await self._update_ui()
+            return
         self._connection_status = "connecting"
+        yield self._pending_ui()
         try:
-            ip, port = target_node.split(":")
-            node = Node(public_ip=ip_address(ip), public_port=int(port))
+            ip, port = _parse_ipport(target_node)
+            node = Node(public_ip=ip, public_port=port)
             result: Dict[str, Any] = await self._client.connect_to(node)
             if result["status"] == "success":
                 self._connection_status = "on"
@@ -113,7 +239,7 @@ class P2PNetworkLauncher:
         except Exception:
             self._connection_status = "error"
             self._connected_node = None
-        return await self._update_ui()
+        yield await self._update_ui()
 
     async def _send_chat_message(self, target_node: str, message: str) -> str:
         """
@@ -124,12 +250,30 @@ class P2PNetworkLauncher:
         :return str: The updated chat log.
         """
         if target_node and target_node == self._connected_node:
-            ip, port = target_node.split(":")
-            result: Dict[str, Any] = await self._client.send_message(message, ip_address(ip), int(port))
+            ip, port = _parse_ipport(target_node)
+            result: Dict[str, Any] = await self._client.send_message(message, ip, port)
             if result["status"] == "success":
                 self._add_chat_message(f"You: {message}")
         return self._chat_history
 
+    def _build_node_choices(self, current_nodes: List[Node]) -> List[str]:
+        """
+        Build the dropdown choices for the given nodes, memoized per node list.
+
+        The rendered choices are rebuilt only when the set of (ip, port)
+        pairs actually changes, not on every UI callback.
+
+        :param List[Node] current_nodes: The nodes currently in the network.
+        :return List[str]: The "ip:port" choices excluding this client's node.
+        """
+        sig = tuple((str(node.public_ip), node.public_port) for node in current_nodes)
+        if sig != self._node_choices_sig:
+            self_node = self._client._node
+            self_key = (str(self_node.public_ip), self_node.public_port)
+            self._node_choices = [f"{ip}:{port}" for ip, port in sig if (ip, port) != self_key]
+            self._node_choices_sig = sig
+        return self._node_choices
+
     async def _update_ui(self) -> List[Any]:
         """
         Update the UI components based on the current state.
@@ -137,17 +281,16 @@ class P2PNetworkLauncher:
         :return List[Any]: A list containing the updated UI components.
         """
         current_nodes = await self._update_current_nodes()
-        node_choices = [f"{node.public_ip}:{node.public_port}" for node in current_nodes if node != self._client._node]
+        node_choices = self._build_node_choices(current_nodes)
+        connected = self._connection_status == "on"
         return [
             self._log,
-            Dropdown(
-                choices=node_choices, interactive=True, value=self._connected_node if self._connected_node else None
-            ),
-            Button(interactive=self._connection_status == "off"),
-            Button(interactive=self._connection_status == "on"),
-            Button(interactive=self._connection_status == "on"),
-            Button(interactive=bool(node_choices)),
-            Button(interactive=self._connection_status == "on" and self._connected_node is not None),
+            update(choices=node_choices, interactive=True, value=self._connected_node),
+            update(interactive=self._connection_status == "off"),
+            update(interactive=connected),
+            update(interactive=connected),
+            update(interactive=bool(node_choices)),
+            update(interactive=connected and self._connected_node is not None),
         ]
 
     def run(self) -> None:
@@ -179,7 +322,7 @@ class P2PNetworkLauncher:
                 outputs=[log_output, node_selector, join_btn, leave_btn, refresh_btn, connect_btn, send_btn],
             )
             refresh_btn.click(
-                fn=self._update_ui,
+                fn=self._refresh_nodes,
                 outputs=[log_output, node_selector, join_btn, leave_btn, refresh_btn, connect_btn, send_btn],
             )
             connect_btn.click(
@@ -200,6 +343,14 @@ def main() -> None:
     """
     Main function to launch the P2P Network application.
     """
+    try:
+        import uvloop
+
+        uvloop.install()
+    except ImportError:
+        # uvloop is optional (and unavailable on Windows); the stock
+        # asyncio event loop works fine, just with higher UDP latency.
+        pass
     launcher = P2PNetworkLauncher()
     launcher.run()
 
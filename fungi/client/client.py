@@ -1,22 +1,96 @@
 import asyncio
-from functools import partial
+import os
+from functools import lru_cache
 from ipaddress import ip_address
 from logging import INFO, Logger
+from time import monotonic
 from typing import Any, Dict, List, Optional, Tuple
 
 import httpx
-import stun
+import orjson
 from pydantic import IPvAnyAddress
 
+from fungi.client.http import aclose_http, get_http
+from fungi.client.stun import MAGIC_COOKIE_BYTES, get_public_address, resolve_stun_host, run_binding_transaction
 from fungi.client.udp import UDPServer
 from fungi.models.node import Node
-from fungi.utils.constants import SERVER_URL, STUN_SERVER
+from fungi.utils.constants import SERVER_URL, STUN_SERVERS
 from fungi.utils.logger import get_logger
 
+try:
+    import miniupnpc
+except ImportError:
+    # UPnP mapping is optional; without it discovery goes straight to STUN.
+    miniupnpc = None
+
+
+# Bodies are serialized with orjson, so the content type is set by hand.
+_JSON_HEADERS = {"Content-Type": "application/json"}
+
+# Process-wide discovery state keyed on the local source port: recent
+# results are reused within a short TTL and concurrent discoveries for
+# the same port share one in-flight probe instead of racing duplicates.
+_discovery_cache: Dict[int, Tuple[Tuple[str, int], float]] = {}
+_discovery_inflight: Dict[int, "asyncio.Task[Tuple[str, int]]"] = {}
+
+
+@lru_cache(maxsize=8)
+def _to_ip(value: str) -> IPvAnyAddress:
+    """
+    Parse an IP string into an address object, memoized.
+
+    STUN keeps returning the same external IP for the lifetime of a NAT
+    mapping, so caching avoids re-validating the same text every refresh.
+
+    :param str value: The IP address string.
+    :return IPvAnyAddress: The parsed address.
+    """
+    return ip_address(value)
+
 
 class Client:
     """Client to join the P2P network"""
 
+    # Fixed attribute layout: the client is a controller object created
+    # once per process, but slots keep attribute access on the punch and
+    # keep-alive hot paths a direct offset load instead of a dict lookup.
+    __slots__ = (
+        "_node",
+        "_logger",
+        "_server_url",
+        "_server_status",
+        "_udp_server",
+        "_node_payload_cache",
+        "_punch_payload_cache",
+        "_update_task",
+        "_keep_alive_task",
+        "_pending_pongs",
+        "_pending_stun",
+        "_shutdown",
+        "_last_pushed_state",
+        "_nodes_etag",
+        "_nodes_list_cache",
+        "_upnp_unavailable",
+    )
+
+    # Delays between punch packets: a fast initial burst while the peer's
+    # NAT mapping is freshest, then exponential backoff up to the timeout.
+    PUNCH_SCHEDULE: Tuple[float, ...] = (0.05, 0.1, 0.25, 0.5, 1.0, 1.0, 2.0, 2.0, 5.0, 5.0, 10.0)
+
+    # Keep-alive cadence: start at the base interval and back off while the
+    # NAT mapping stays stable, resetting as soon as it changes.
+    KEEPALIVE_INTERVAL: float = 30.0
+    MAX_KEEPALIVE_INTERVAL: float = 120.0
+
+    # How long a discovered mapping may be reused by new joins in this
+    # process before a fresh probe is required.
+    STUN_CACHE_TTL: float = 30.0
+
+    # Wire prefixes for control datagrams. Classification compares the
+    # first two bytes, which is unambiguous between "punch" and "pong" and
+    # costs a single short memcmp per branch.
+    PONG_MESSAGE: bytes = b"pong"
+
     def __init__(
         self,
         server_url: str = SERVER_URL,
@@ -33,6 +107,76 @@ class Client:
         self._server_url: str = server_url
         self._server_status: bool = False
         self._udp_server: UDPServer = UDPServer(self._handle_message)
+        self._node_payload_cache: Optional[Dict[str, Any]] = None
+        self._punch_payload_cache: Optional[bytes] = None
+        self._update_task: Optional[asyncio.Task] = None
+        self._keep_alive_task: Optional[asyncio.Task] = None
+        self._pending_pongs: Dict[Tuple[str, int], asyncio.Future] = {}
+        self._pending_stun: Dict[bytes, asyncio.Future] = {}
+        self._shutdown: asyncio.Event = asyncio.Event()
+        self._last_pushed_state: Optional[Tuple[Any, ...]] = None
+        self._nodes_etag: Optional[str] = None
+        self._nodes_list_cache: List[Node] = []
+        self._upnp_unavailable: bool = miniupnpc is None
+
+    def _node_payload(self) -> Dict[str, Any]:
+        """
+        Get the node's JSON payload, rebuilt only after a mapping change.
+
+        :return Dict[str, Any]: The JSON-ready representation of the node.
+        """
+        if self._node_payload_cache is None:
+            self._node_payload_cache = self._node.model_dump(mode="json")
+        return self._node_payload_cache
+
+    def _punch_payload(self) -> bytes:
+        """
+        Get the encoded punch message, rebuilt only after a mapping change.
+
+        :return bytes: The "punch:<public_ip>:<public_port>" datagram payload.
+        """
+        if self._punch_payload_cache is None:
+            self._punch_payload_cache = f"punch:{self._node.public_ip}:{self._node.public_port}".encode()
+        return self._punch_payload_cache
+
+    def _invalidate_node_caches(self) -> None:
+        """
+        Drop cached serializations after the node's addressing changed.
+        """
+        self._node_payload_cache = None
+        self._punch_payload_cache = None
+
+    def _get_http(self) -> httpx.AsyncClient:
+        """
+        Get the shared HTTP client for this client's server URL.
+
+        The pool lives at module scope (see fungi.client.http), so several
+        Client instances on the same loop share one set of connections.
+
+        :return httpx.AsyncClient: The shared HTTP client.
+        """
+        return get_http(self._server_url)
+
+    async def aclose(self) -> None:
+        """
+        Close the pooled HTTP connections for this client's server URL.
+        """
+        await aclose_http(self._server_url)
+
+    async def __aenter__(self) -> "Client":
+        """
+        Enter the client as an async context manager.
+
+        :return Client: The client itself.
+        """
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        """
+        Leave the network and release pooled connections on exit.
+        """
+        await self.leave_network()
+        await self.aclose()
 
     ############################
     #  Core network operations #
@@ -48,17 +192,31 @@ class Client:
             self._logger.info(" 💡 Already part of the network")
             return {"status": "success", "message": "Already part of the network"}
 
-        if not await self._discover_public_ip_and_port():
+        # STUN discovery and the TCP/TLS setup toward the signaling server
+        # are independent, so overlap them: the insert that follows then
+        # reuses an already-warm connection.
+        (public_ip, public_port), _ = await asyncio.gather(
+            self._discover_public_ip_and_port(), self._warm_http()
+        )
+        if public_ip is None or public_port is None:
             return {"status": "fail", "message": "Failed to discover public IP and port"}
+        self._node = self._node.model_copy(update={"public_ip": public_ip, "public_port": public_port})
+        self._invalidate_node_caches()
 
-        insert_result = await self._insert_node()
+        # Registration and the local datagram bind are independent once the
+        # mapping is known, so they run concurrently as well.
+        insert_result, _ = await asyncio.gather(self._insert_node(), self._start_server())
         if insert_result["status"] != "success":
+            await self._stop_server()
             return insert_result
+        self._last_pushed_state = self._state_key()
 
-        await self._start_server()
-        asyncio.create_task(self.keep_alive())
+        # Hold a strong reference: a bare create_task result can be
+        # garbage-collected mid-flight, silently killing the NAT refresh.
+        self._keep_alive_task = asyncio.create_task(self.keep_alive(), name="p2p-keepalive")
         self._logger.info(" ✅ Joined network successfully")
-        return {"status": "success", "message": "Joined network successfully"}
+        nodes = self._parse_nodes(insert_result.get("nodes", []))
+        return {"status": "success", "message": "Joined network successfully", "nodes": nodes}
 
     async def leave_network(self) -> Dict[str, Any]:
         """
@@ -73,63 +231,205 @@ class Client:
         delete_result = await self._delete_node()
         if delete_result["status"] != "success":
             return delete_result
+        self._last_pushed_state = None
 
         await self._stop_server()
+        if self._keep_alive_task is not None:
+            self._keep_alive_task.cancel()
+            self._keep_alive_task = None
         self._server_status = False
+        await self.aclose()
         self._logger.info(" ✅ Left the network.")
         return {"status": "success", "message": "Left the network successfully"}
 
     async def keep_alive(self) -> None:
         """
         Periodically rediscover public IP and port to keep the NAT mapping alive.
+
+        The refresh interval backs off while the mapping is observed to be
+        stable, so long-lived sessions burn fewer STUN round-trips, and
+        snaps back to the base interval whenever the mapping changes. The
+        sleep races the shutdown event so leaving the network wakes the
+        loop immediately instead of waiting out the interval.
+
+        Cadence is anchored to monotonic deadlines rather than a fixed
+        sleep after the work, so a slow discovery does not push every
+        subsequent refresh later and risk the NAT binding expiring.
         """
+        loop = asyncio.get_running_loop()
+        interval = self.KEEPALIVE_INTERVAL
+        next_deadline = loop.time() + interval
         while self._server_status:
-            new_ip, new_port = await self._discover_public_ip_and_port()
+            try:
+                new_ip, new_port = await asyncio.wait_for(self._discover_public_ip_and_port(force=True), timeout=10)
+            except asyncio.TimeoutError:
+                new_ip, new_port = None, None
             if new_ip is not None and new_port is not None:
                 ip_changed = new_ip != self._node.public_ip
                 port_changed = new_port != self._node.public_port
 
                 if ip_changed or port_changed:
-                    self._node.public_ip = ip_address(new_ip)
-                    self._node.public_port = new_port
-                    update_result = await self._update_node()
-                    if update_result["status"] != "success":
-                        self._logger.error(f" ❌ Failed to update node info: {update_result['message']}")
+                    interval = self.KEEPALIVE_INTERVAL
+                    self._node = self._node.model_copy(update={"public_ip": new_ip, "public_port": new_port})
+                    self._invalidate_node_caches()
+                    self._schedule_node_update()
 
                     if port_changed:
                         self._logger.info(
                             f" 💡 Public port changed from {self._node.local_port} to {new_port}. Restarting server."
                         )
                         await self._stop_server()
-                        self._node.local_port = new_port
+                        self._node = self._node.model_copy(update={"local_port": new_port})
+                        self._invalidate_node_caches()
                         await self._start_server()
+                else:
+                    interval = min(interval * 1.5, self.MAX_KEEPALIVE_INTERVAL)
 
-            await asyncio.sleep(30)  # Send keep-alive every 30 seconds
+            delay = max(0.0, next_deadline - loop.time())
+            next_deadline = max(next_deadline + interval, loop.time() + interval)
+            try:
+                await asyncio.wait_for(self._shutdown.wait(), timeout=delay)
+                break
+            except asyncio.TimeoutError:
+                pass
 
     #####################
     #  Node management  #
     #####################
 
+    def _state_key(self) -> Tuple[Any, ...]:
+        """
+        Get the addressing state last visible to the server, as a cheap key.
+
+        :return Tuple[Any, ...]: The (local_ip, local_port, public_ip, public_port) tuple.
+        """
+        return (self._node.local_ip, self._node.local_port, self._node.public_ip, self._node.public_port)
+
+    def _schedule_node_update(self) -> None:
+        """
+        Push the node's new addressing to the server in the background.
+
+        The PUT is not on the critical NAT-refresh path, so it runs as a
+        task instead of blocking the keep-alive loop; rapid successive
+        changes coalesce onto the already-running update.
+        """
+        if self._update_task is not None and not self._update_task.done():
+            return
+        self._update_task = asyncio.create_task(self._push_node_update())
+
+    async def _push_node_update(self) -> None:
+        """
+        Send the node update and log a failure without raising.
+
+        A short delay lets rapid successive mapping changes (an IP change
+        immediately followed by a port change) collapse into one request.
+        The push then loops until the addressing it sent matches the
+        current state: _schedule_node_update coalesces onto this task, so
+        a change that lands while a request is in flight must be picked up
+        here or it would never reach the server.
+        """
+        await asyncio.sleep(0.2)
+        while True:
+            state = self._state_key()
+            if state == self._last_pushed_state:
+                return
+            update_result = await self._batch([{"op": "update", "node": self._node_payload()}])
+            if update_result["status"] != "success":
+                self._logger.error(f" ❌ Failed to update node info: {update_result['message']}")
+                return
+            self._last_pushed_state = state
+
+    async def _batch(self, ops: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Apply several node operations in a single server round trip.
+
+        :param List[Dict[str, Any]] ops: Operations as {"op": ..., "node": ...} dictionaries.
+        :return Dict[str, Any]: A dictionary containing the batch status and message.
+        """
+        result = await self._do_request("POST", "/nodes/batch", "Apply batch", content=orjson.dumps(ops))
+        result.pop("response", None)
+        return result
+
+    async def _warm_http(self) -> None:
+        """
+        Establish the signaling connection ahead of the first real request.
+
+        Failures are swallowed; whatever is wrong will surface on the
+        request that actually matters.
+        """
+        try:
+            await self._get_http().head("/nodes")
+        except httpx.HTTPError:
+            pass
+
+    async def _do_request(
+        self,
+        method: str,
+        path: str,
+        action: str,
+        content: Optional[bytes] = None,
+        params: Optional[Dict[str, Any]] = None,
+        headers: Optional[Dict[str, str]] = None,
+        retries: int = 2,
+    ) -> Dict[str, Any]:
+        """
+        Issue a signaling request, retrying transient network errors.
+
+        Server-side rejections (4xx/5xx) fail immediately; connection-level
+        errors back off exponentially before retrying so a blip does not
+        drop a keep-alive update. A 304 Not Modified counts as success so
+        conditional GETs can serve their cache. On success the raw response
+        rides along under the "response" key for callers that need the body.
+
+        :param str method: The HTTP method to use.
+        :param str path: The request path on the signaling server.
+        :param str action: A short action name used in messages and logs.
+        :param Optional[bytes] content: The pre-encoded JSON body, if any.
+        :param Optional[Dict[str, Any]] params: The query parameters, if any.
+        :param Optional[Dict[str, str]] headers: Extra request headers, if any.
+        :param int retries: How many times to retry transient failures.
+        :return Dict[str, Any]: A dictionary containing the request status, message and response.
+        """
+        if content is not None:
+            headers = {**_JSON_HEADERS, **(headers or {})}
+        for attempt in range(retries + 1):
+            try:
+                response = await self._get_http().request(
+                    method, path, content=content, params=params, headers=headers
+                )
+                if response.status_code != 304:
+                    response.raise_for_status()
+                return {"status": "success", "message": f"{action} succeeded", "response": response}
+            except httpx.HTTPStatusError as e:
+                err = f"{action} failed: {e.response.text}"
+                self._logger.error(f" ❌ {err}")
+                return {"status": "fail", "message": err}
+            except httpx.RequestError as e:
+                if attempt < retries:
+                    await asyncio.sleep(0.2 * (2**attempt))
+                    continue
+                err = f"{action} failed after {retries + 1} attempts: {e}"
+                self._logger.error(f" ❌ {err}")
+                return {"status": "fail", "message": err}
+        return {"status": "fail", "message": f"{action} failed"}
+
     async def _insert_node(self) -> Dict[str, Any]:
         """
         Insert the node information into the central server.
 
-        :return Dict[str, Any]: A dictionary containing the insert status and message.
+        The server piggy-backs the current node list onto its response, so a
+        successful insert also returns the nodes without an extra round-trip.
+
+        :return Dict[str, Any]: A dictionary containing the insert status, message and current nodes.
         """
-        node_data = self._node.model_dump(mode="json")
-        try:
-            async with httpx.AsyncClient() as client:
-                response = await client.post(f"{self._server_url}/nodes", json=node_data)
-                response.raise_for_status()
-            return {"status": "success", "message": "Node inserted successfully"}
-        except httpx.HTTPStatusError as e:
-            err = f"Failed to insert node: {e.response.text}"
-            self._logger.error(f" ❌ {err}")
-            return {"status": "fail", "message": err}
-        except httpx.RequestError as e:
-            err = f"An error occurred while inserting node: {e}"
-            self._logger.error(f" ❌ {err}")
-            return {"status": "fail", "message": err}
+        result = await self._do_request(
+            "POST", "/nodes", "Insert node", content=orjson.dumps(self._node_payload())
+        )
+        if result["status"] != "success":
+            return result
+        payload = orjson.loads(result["response"].content)
+        nodes = payload.get("nodes", []) if isinstance(payload, dict) else []
+        return {"status": "success", "message": "Node inserted successfully", "nodes": nodes}
 
     async def _delete_node(self) -> Dict[str, Any]:
         """
@@ -137,40 +437,27 @@ class Client:
 
         :return Dict[str, Any]: A dictionary containing the delete status and message.
         """
-        params = self._node.model_dump(mode="json")
-        try:
-            async with httpx.AsyncClient() as client:
-                response = await client.delete(f"{self._server_url}/nodes", params=params)
-                response.raise_for_status()
-            return {"status": "success", "message": "Node deleted successfully"}
-        except httpx.HTTPStatusError as e:
-            err = f"Failed to delete node: {e.response.text}"
-            self._logger.error(f" ❌ {err}")
-            return {"status": "fail", "message": err}
-        except httpx.RequestError as e:
-            err = f"An error occurred while deleting node: {e}"
-            self._logger.error(f" ❌ {err}")
-            return {"status": "fail", "message": err}
+        result = await self._do_request("DELETE", "/nodes", "Delete node", params=self._node_payload())
+        result.pop("response", None)
+        return result
 
-    async def _update_node(self) -> Dict[str, Any]:
+    def _parse_nodes(self, raw: List[Dict[str, Any]]) -> List[Node]:
         """
-        Update the node information on the signaling server.
+        Build Node objects from raw server data, excluding this client's node.
+
+        Entries are filtered on the raw (public_ip, public_port) strings
+        before any model is built, and the survivors are assembled with
+        model_construct: the data comes from our own server, which already
+        validated it on the way in, so re-running every field validator on
+        each poll only burns CPU.
 
-        :return Dict[str, Any]: A dictionary containing the update status and message.
+        :param List[Dict[str, Any]] raw: The raw node dictionaries from the server.
+        :return List[Node]: The other nodes on the network.
         """
-        try:
-            async with httpx.AsyncClient() as client:
-                response = await client.put(f"{self._server_url}/nodes", json=self._node.model_dump(mode="json"))
-                response.raise_for_status()
-            return {"status": "success", "message": "Node updated successfully"}
-        except httpx.HTTPStatusError as e:
-            err = f"Failed to update node: {e.response.text}"
-            self._logger.error(f" ❌ {err}")
-            return {"status": "fail", "message": err}
-        except httpx.RequestError as e:
-            err = f"An error occurred while updating node: {e}"
-            self._logger.error(f" ❌ {err}")
-            return {"status": "fail", "message": err}
+        self_key = (str(self._node.public_ip), self._node.public_port)
+        return [
+            Node.model_construct(**x) for x in raw if (str(x.get("public_ip")), x.get("public_port")) != self_key
+        ]
 
     async def get_nodes(self) -> List[Node]:
         """
@@ -178,18 +465,19 @@ class Client:
 
         :return List[Node]: A list of current nodes on the network.
         """
-        try:
-            async with httpx.AsyncClient() as client:
-                response = await client.get(f"{self._server_url}/nodes")
-                response.raise_for_status()
-            nodes = [Node(**x) for x in response.json() if Node(**x) != self._node]
-            self._logger.info(" ✅ Got nodes successfully")
-            return nodes
-        except httpx.HTTPStatusError as e:
-            self._logger.error(f" ❌ Failed to get nodes: {e.response.text}")
-        except httpx.RequestError as e:
-            self._logger.error(f" ❌ An error occurred while requesting: {e}")
-        return []
+        headers = {"If-None-Match": self._nodes_etag} if self._nodes_etag else None
+        result = await self._do_request("GET", "/nodes", "Get nodes", headers=headers)
+        if result["status"] != "success":
+            return []
+        response = result["response"]
+        if response.status_code == 304:
+            # Unchanged on the server: reuse the parsed list, skip the body.
+            return self._nodes_list_cache
+        nodes = self._parse_nodes(orjson.loads(response.content))
+        self._nodes_etag = response.headers.get("etag")
+        self._nodes_list_cache = nodes
+        self._logger.info(" ✅ Got nodes successfully")
+        return nodes
 
     ############################
     # Connection and messaging #
@@ -206,20 +494,53 @@ class Client:
         if not self._validate_connection_prerequisites(other_node):
             return {"status": "fail", "message": "Connection prerequisites not met"}
 
-        connection_established = asyncio.Event()
-        self._udp_server.set_connection_callback(connection_established.set)
-
-        # Send punch messages
-        punch_task = asyncio.create_task(self._send_punch_messages(other_node))
-
+        loop = asyncio.get_running_loop()
+        addrs = other_node.candidates()
+        payload = self._punch_payload()
+        batch = [(payload, addr) for addr in addrs]
+        pong_received: asyncio.Future = loop.create_future()
+        for addr in addrs:
+            self._pending_pongs[addr] = pong_received
+        deadline = loop.time() + timeout
+
+        # Punch and listen in a single loop: probe every candidate address
+        # (public mapping plus possible shared LAN), then await the pong
+        # for the scheduled delay. Whichever candidate answers first wins.
         try:
-            await asyncio.wait_for(connection_established.wait(), timeout=timeout)
-            return {"status": "success", "message": "Connection established"}
-        except asyncio.TimeoutError:
+            for delay in self.PUNCH_SCHEDULE:
+                self._udp_server.send_many(batch)
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    await asyncio.wait_for(asyncio.shield(pong_received), timeout=min(delay, remaining))
+                    return {"status": "success", "message": "Connection established"}
+                except asyncio.TimeoutError:
+                    continue
             return {"status": "fail", "message": "Connection attempt timed out"}
         finally:
-            punch_task.cancel()
-            self._udp_server.set_connection_callback(None)
+            for addr in addrs:
+                self._pending_pongs.pop(addr, None)
+
+    async def punch_all(self, peers: List[Node], concurrency: int = 200) -> List[Dict[str, Any]]:
+        """
+        Attempt hole punching toward several peers concurrently.
+
+        A semaphore bounds the number of in-flight attempts so a large peer
+        list cannot flood the event loop with thousands of simultaneous
+        punch loops.
+
+        :param List[Node] peers: The nodes to connect to.
+        :param int concurrency: The maximum number of concurrent attempts.
+        :return List[Dict[str, Any]]: One status dictionary per peer, in input order.
+        """
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def _punch(peer: Node) -> Dict[str, Any]:
+            async with semaphore:
+                return await self.connect_to(peer)
+
+        return list(await asyncio.gather(*(_punch(peer) for peer in peers)))
 
     async def send_message(self, message: str, target_ip: IPvAnyAddress, target_port: int) -> Dict[str, Any]:
         """
@@ -231,7 +552,7 @@ class Client:
         :return Dict[str, Any]: A dictionary containing the send status and message.
         """
         try:
-            self._udp_server.send_message(message, str(target_ip), target_port)
+            self._udp_server.send_message(message, (str(target_ip), target_port))
             self._logger.info(f" ✅ Sent message to {target_ip}:{target_port}")
             return {"status": "success", "message": f"Message sent to {target_ip}:{target_port}"}
         except Exception as e:
@@ -254,6 +575,7 @@ class Client:
             await self._udp_server.start(str(self._node.local_ip), self._node.local_port)
             self._logger.info(f" ✅ Serving on {self._node.local_ip}:{self._node.local_port}")
             self._server_status = True
+            self._shutdown.clear()
         except OSError as e:
             error_message = f"Failed to start server: {e}"
             self._logger.error(f" ❌ {error_message}")
@@ -267,6 +589,7 @@ class Client:
             self._logger.info(" 💡 Server is not running")
             return
 
+        self._shutdown.set()
         await self._udp_server.stop()
         self._server_status = False
         self._logger.info(" ✅ Server has been stopped")
@@ -275,34 +598,140 @@ class Client:
     #  Network discovery  #
     #######################
 
-    async def _discover_public_ip_and_port(self) -> Tuple[Optional[IPvAnyAddress], Optional[int]]:
+    async def _try_upnp_mapping(self) -> Optional[Tuple[str, int]]:
         """
-        Discover the public IP and port using a STUN server.
+        Try to map the local port on the router via UPnP, best effort.
+
+        A successful mapping pins a stable external port equal to the local
+        one, which makes hole punching trivial. Any failure (no gateway, no
+        IGD, library missing) marks UPnP unavailable so later discovery
+        cycles skip the probe and go straight to STUN.
 
+        :return Optional[Tuple[str, int]]: The external (IP, port), or None if unavailable.
+        """
+        if self._upnp_unavailable:
+            return None
+
+        def _map() -> Optional[Tuple[str, int]]:
+            upnp = miniupnpc.UPnP()
+            upnp.discoverdelay = 200
+            if upnp.discover() == 0:
+                return None
+            upnp.selectigd()
+            upnp.addportmapping(
+                self._node.local_port, "UDP", upnp.lanaddr, self._node.local_port, "fungi p2p", ""
+            )
+            return upnp.externalipaddress(), self._node.local_port
+
+        try:
+            mapped = await asyncio.wait_for(asyncio.to_thread(_map), timeout=1.0)
+        except Exception:  # miniupnpc raises bare Exception on IGD errors
+            mapped = None
+        if mapped is None:
+            self._upnp_unavailable = True
+        return mapped
+
+    async def _discover_public_ip_and_port(self, force: bool = False) -> Tuple[Optional[IPvAnyAddress], Optional[int]]:
+        """
+        Discover the public IP and port, reusing recent or in-flight probes.
+
+        Results are cached per source port for STUN_CACHE_TTL seconds, so
+        several clients joining in one process share a single probe rather
+        than each paying the round-trip. keep_alive passes force=True, as
+        its whole purpose is to re-check the mapping.
+
+        :param bool force: Skip the cached result (in-flight probes are still shared).
         :return Tuple[Optional[IPvAnyAddress], Optional[int]]: A tuple containing the public IP and port.
         """
+        source_port = self._node.local_port
+        cached = _discovery_cache.get(source_port)
+        if not force and cached is not None and monotonic() - cached[1] < self.STUN_CACHE_TTL:
+            ip, port = cached[0]
+            return _to_ip(ip), port
+
+        probe = _discovery_inflight.get(source_port)
+        if probe is None:
+            probe = asyncio.create_task(self._probe_public_address())
+            _discovery_inflight[source_port] = probe
+            probe.add_done_callback(lambda _: _discovery_inflight.pop(source_port, None))
         try:
-            _, external_ip, external_port = await self._async_get_ip_info()
-            self._logger.debug(f" 💡 Discovered public IP and port: {external_ip}:{external_port}")
-            return ip_address(external_ip), external_port
+            ip, port = await asyncio.shield(probe)
         except Exception as e:
             self._logger.error(f" ❌ Failed to discover public IP and port: {e}")
             return None, None
+        _discovery_cache[source_port] = ((ip, port), monotonic())
+        return _to_ip(ip), port
 
-    async def _async_get_ip_info(self) -> Tuple[str, str, int]:
+    async def _probe_public_address(self) -> Tuple[str, int]:
         """
-        Async version of the get ip info stun method.
+        Probe the public mapping: UPnP first, then the raced STUN servers.
+
+        A UPnP port mapping is attempted first: when the router cooperates
+        it yields a stable external port without any punching races. The
+        STUN servers are otherwise queried concurrently and the first
+        successful response wins, so one lost datagram or slow server does
+        not stall discovery for its full timeout.
 
-        :return Tuple[str, str, int]: A tuple containing NAT type, external IP, and external port.
+        :return Tuple[str, int]: The public (IP, port) of this client.
+        :raises Exception: The last STUN failure if every server fails.
         """
-        loop = asyncio.get_running_loop()
-        get_ip_info_partial = partial(
-            stun.get_ip_info,
-            stun_host=STUN_SERVER[0],
-            stun_port=STUN_SERVER[1],
-            source_port=self._node.local_port,
-        )
-        return await loop.run_in_executor(None, get_ip_info_partial)
+        mapped = await self._try_upnp_mapping()
+        if mapped is not None:
+            self._logger.debug(" 💡 UPnP mapping established: %s:%s", mapped[0], mapped[1])
+            return mapped
+
+        # While the P2P socket is bound, the transaction must run over it:
+        # a second socket on the same port would receive an arbitrary share
+        # of inbound datagrams, so its Binding Response may never arrive.
+        if self._server_status:
+            tasks = [asyncio.create_task(self._stun_query(host, port)) for host, port in STUN_SERVERS]
+        else:
+            tasks = [
+                asyncio.create_task(get_public_address(host, port, source_port=self._node.local_port))
+                for host, port in STUN_SERVERS
+            ]
+        last_error: Optional[BaseException] = None
+        try:
+            pending = set(tasks)
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        external_ip, external_port = task.result()
+                        self._logger.debug(" 💡 Discovered public IP and port: %s:%s", external_ip, external_port)
+                        return external_ip, external_port
+                    last_error = task.exception()
+            raise last_error if last_error else RuntimeError("No STUN server configured")
+        finally:
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+
+    async def _stun_query(self, stun_host: str, stun_port: int, timeout: float = 2.0) -> Tuple[str, int]:
+        """
+        Run a Binding transaction over the live P2P socket.
+
+        The request goes out through the bound UDP server, so the mapping
+        the STUN server reports is exactly the one peers punch toward, and
+        the response comes back to the socket we are already reading.
+        Responses are matched to their transaction in _handle_message via
+        the pending-future table keyed on the transaction ID.
+
+        :param str stun_host: The STUN server hostname or IP.
+        :param int stun_port: The STUN server port.
+        :param float timeout: Seconds to wait for the response.
+        :return Tuple[str, int]: The public (IP, port) of this client.
+        """
+        server_ip = await resolve_stun_host(stun_host, stun_port)
+        transaction_id = os.urandom(12)
+        response: asyncio.Future = asyncio.get_running_loop().create_future()
+        self._pending_stun[transaction_id] = response
+        try:
+            return await run_binding_transaction(
+                self._udp_server.sendto, response, transaction_id, (server_ip, stun_port), timeout
+            )
+        finally:
+            self._pending_stun.pop(transaction_id, None)
 
     ####################
     #  Helper methods  #
@@ -326,34 +755,53 @@ class Client:
             return False
         return True
 
-    async def _send_punch_messages(self, other_node: Node, n_tries: int = 30) -> None:
-        """
-        Send punch messages to initiate hole punching.
-
-        :param Node other_node: The node to send punch messages to.
-        :param int n_tries: The number of tries to send punch messages.
+    def _handle_message(self, message: bytes, sender: Tuple[str, int]) -> None:
         """
-        message = f"punch:{self._node.public_ip}:{self._node.public_port}"
-        for _ in range(n_tries):
-            if other_node.public_ip is not None and other_node.public_port is not None:
-                await self.send_message(message, other_node.public_ip, other_node.public_port)
-                await asyncio.sleep(1)  # Wait a second between punches
+        Handle an incoming datagram.
 
-    def _handle_message(self, message: str, sender: Tuple[str, int]) -> None:
-        """
-        Handle an incoming message.
+        STUN Binding Responses are recognized first, by the RFC 5389 magic
+        cookie at bytes 4:8, and routed to the rediscovery transaction they
+        answer. Remaining control messages are classified on the first two
+        raw bytes; the payload is only decoded for the human-readable log
+        line.
 
-        :param str message: The received message.
+        :param bytes message: The received datagram.
         :param Tuple[str, int] sender: The sender's address (IP, port).
         """
-        self._logger.info(f" 💡 Received message from {sender}: {message}")
-        if message.startswith("punch"):
+        if len(message) >= 20 and message[4:8] == MAGIC_COOKIE_BYTES:
+            future = self._pending_stun.get(message[8:20])
+            if future is not None and not future.done():
+                future.set_result(message)
+            return
+        if self._logger.isEnabledFor(INFO):
+            self._logger.info(" 💡 Received message from %s: %s", sender, message.decode(errors="replace"))
+        prefix = message[:2]
+        if prefix == b"pu":
             # Respond to punch message
-            self._udp_server.send_message("pong", sender[0], sender[1])
-        elif message.startswith("pong"):
-            # Connection established
-            if self._udp_server.connection_callback:
-                self._udp_server.connection_callback()
+            self._udp_server.sendto(self.PONG_MESSAGE, sender)
+        elif prefix == b"po":
+            self._resolve_pong(sender)
+
+    def _resolve_pong(self, sender: Tuple[str, int]) -> None:
+        """
+        Resolve the pending connection attempt matching a received pong.
+
+        Keyed on the sender's address so a late pong from an earlier peer
+        cannot complete an unrelated attempt. If the NAT rewrote the source
+        port and there is exactly one attempt in flight, that one is taken.
+        An attempt registers the same future under each of its candidate
+        addresses, so "one attempt" means one distinct future, not one key.
+
+        :param Tuple[str, int] sender: The pong sender's address (IP, port).
+        """
+        future = self._pending_pongs.pop(sender, None)
+        if future is None and self._pending_pongs:
+            futures = set(self._pending_pongs.values())
+            if len(futures) == 1:
+                future = futures.pop()
+                self._pending_pongs.clear()
+        if future is not None and not future.done():
+            future.set_result(sender)
 
     def __str__(self) -> str:
         """
@@ -0,0 +1,59 @@
+import asyncio
+import weakref
+from typing import Dict, Optional
+
+import httpx
+
+# One pooled client per (event loop, base URL): connections cannot be
+# shared across loops, and the weak keys let a finished loop's entry be
+# collected with it. Every Client instance on the same loop reuses the
+# same pool, so spinning up several clients costs one handshake total.
+_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[str, httpx.AsyncClient]]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def get_http(base_url: str) -> httpx.AsyncClient:
+    """
+    Get the process-wide pooled HTTP client for a server URL.
+
+    The client is created lazily for the running loop and kept until
+    aclose_http is called, with HTTP/2 multiplexing, keep-alive pooling
+    and one transport-level retry for transient connection errors.
+
+    :param str base_url: The signaling server base URL.
+    :return httpx.AsyncClient: The shared HTTP client for this loop.
+    """
+    loop = asyncio.get_running_loop()
+    per_loop = _clients.setdefault(loop, {})
+    client = per_loop.get(base_url)
+    if client is None or client.is_closed:
+        client = httpx.AsyncClient(
+            base_url=base_url,
+            http2=True,
+            timeout=10.0,
+            transport=httpx.AsyncHTTPTransport(
+                retries=1,
+                http2=True,
+                limits=httpx.Limits(max_keepalive_connections=20, max_connections=100),
+            ),
+        )
+        per_loop[base_url] = client
+    return client
+
+
+async def aclose_http(base_url: Optional[str] = None) -> None:
+    """
+    Close pooled HTTP clients belonging to the running loop.
+
+    :param Optional[str] base_url: A specific server URL to close, or None for all.
+    """
+    loop = asyncio.get_running_loop()
+    per_loop = _clients.get(loop)
+    if not per_loop:
+        return
+    urls = [base_url] if base_url is not None else list(per_loop)
+    for url in urls:
+        client = per_loop.pop(url, None)
+        if client is not None and not client.is_closed:
+            await client.aclose()
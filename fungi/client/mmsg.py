@@ -0,0 +1,95 @@
+import ctypes
+import sys
+from socket import htons, inet_aton
+from typing import List, Tuple
+
+# How many datagrams are submitted to the kernel per sendmmsg(2) call.
+BATCH_SIZE = 32
+
+
+class _IoVec(ctypes.Structure):
+    _fields_ = [("iov_base", ctypes.c_void_p), ("iov_len", ctypes.c_size_t)]
+
+
+class _SockAddrIn(ctypes.Structure):
+    _fields_ = [
+        ("sin_family", ctypes.c_ushort),
+        ("sin_port", ctypes.c_uint16),
+        ("sin_addr", ctypes.c_ubyte * 4),
+        ("sin_zero", ctypes.c_ubyte * 8),
+    ]
+
+
+class _MsgHdr(ctypes.Structure):
+    _fields_ = [
+        ("msg_name", ctypes.c_void_p),
+        ("msg_namelen", ctypes.c_uint),
+        ("msg_iov", ctypes.POINTER(_IoVec)),
+        ("msg_iovlen", ctypes.c_size_t),
+        ("msg_control", ctypes.c_void_p),
+        ("msg_controllen", ctypes.c_size_t),
+        ("msg_flags", ctypes.c_int),
+    ]
+
+
+class _MMsgHdr(ctypes.Structure):
+    _fields_ = [("msg_hdr", _MsgHdr), ("msg_len", ctypes.c_uint)]
+
+
+_AF_INET = 2
+
+_libc = None
+if sys.platform == "linux":
+    try:
+        _libc = ctypes.CDLL("libc.so.6", use_errno=True)
+        if not hasattr(_libc, "sendmmsg"):
+            _libc = None
+    except OSError:
+        _libc = None
+
+
+def available() -> bool:
+    """
+    Whether batched sends via sendmmsg(2) are usable on this platform.
+
+    :return bool: True on Linux with a loadable libc exposing sendmmsg.
+    """
+    return _libc is not None
+
+
+def sendmmsg(fd: int, messages: List[Tuple[bytes, Tuple[str, int]]]) -> int:
+    """
+    Send several datagrams with one syscall per batch of BATCH_SIZE.
+
+    :param int fd: The UDP socket's file descriptor.
+    :param List[Tuple[bytes, Tuple[str, int]]] messages: (payload, (ip, port)) pairs to send.
+    :return int: The number of datagrams handed to the kernel.
+    """
+    if _libc is None:
+        raise OSError("sendmmsg is not available on this platform")
+    sent_total = 0
+    for start in range(0, len(messages), BATCH_SIZE):
+        batch = messages[start : start + BATCH_SIZE]
+        count = len(batch)
+        # Keep references alive for the duration of the syscall.
+        buffers = [ctypes.create_string_buffer(payload, len(payload)) for payload, _ in batch]
+        iovecs = (_IoVec * count)()
+        addrs = (_SockAddrIn * count)()
+        headers = (_MMsgHdr * count)()
+        for i, (payload, (ip, port)) in enumerate(batch):
+            iovecs[i].iov_base = ctypes.cast(buffers[i], ctypes.c_void_p)
+            iovecs[i].iov_len = len(payload)
+            addrs[i].sin_family = _AF_INET
+            addrs[i].sin_port = htons(port)
+            addrs[i].sin_addr = (ctypes.c_ubyte * 4)(*inet_aton(ip))
+            headers[i].msg_hdr.msg_name = ctypes.cast(ctypes.pointer(addrs[i]), ctypes.c_void_p)
+            headers[i].msg_hdr.msg_namelen = ctypes.sizeof(_SockAddrIn)
+            headers[i].msg_hdr.msg_iov = ctypes.pointer(iovecs[i])
+            headers[i].msg_hdr.msg_iovlen = 1
+        sent = _libc.sendmmsg(fd, headers, count, 0)
+        if sent < 0:
+            raise OSError(ctypes.get_errno(), "sendmmsg failed")
+        sent_total += sent
+        if sent < count:
+            break
+    return sent_total
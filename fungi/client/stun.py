@@ -0,0 +1,196 @@
+import asyncio
+import os
+import socket
+import struct
+from time import monotonic
+from typing import Callable, Dict, Tuple
+
+# RFC 5389 constants for the STUN Binding transaction. The cookie's wire
+# encoding sits at bytes 4:8 of every RFC 5389 message, which is what
+# lets a receiver tell a Binding Response apart from application traffic.
+MAGIC_COOKIE = 0x2112A442
+MAGIC_COOKIE_BYTES = MAGIC_COOKIE.to_bytes(4, "big")
+BINDING_REQUEST = 0x0001
+BINDING_RESPONSE = 0x0101
+XOR_MAPPED_ADDRESS = 0x0020
+MAPPED_ADDRESS = 0x0001
+
+# How long to wait for a Binding Response before resending the request.
+# UDP gives no delivery guarantee, so a lost 20-byte request would
+# otherwise stall the transaction for its full timeout.
+RETRANSMIT_INTERVAL = 0.5
+
+# Resolved STUN server addresses, kept for DNS_TTL seconds. STUN servers
+# sit behind long-lived anycast records, so re-resolving every keep-alive
+# would only re-pay getaddrinfo latency for the same answer.
+DNS_TTL = 900.0
+_dns_cache: Dict[Tuple[str, int], Tuple[str, float]] = {}
+
+
+async def resolve_stun_host(host: str, port: int) -> str:
+    """
+    Resolve a STUN server hostname to an IP, with a TTL cache.
+
+    Uses the loop's non-blocking getaddrinfo. On resolution failure a
+    stale cached address is served rather than failing the discovery.
+
+    :param str host: The STUN server hostname or IP.
+    :param int port: The STUN server port.
+    :return str: The resolved IPv4 address.
+    """
+    key = (host, port)
+    cached = _dns_cache.get(key)
+    if cached is not None and monotonic() - cached[1] < DNS_TTL:
+        return cached[0]
+    loop = asyncio.get_running_loop()
+    try:
+        infos = await loop.getaddrinfo(host, port, family=socket.AF_INET, type=socket.SOCK_DGRAM)
+        address = infos[0][4][0]
+    except OSError:
+        if cached is not None:
+            return cached[0]
+        raise
+    _dns_cache[key] = (address, monotonic())
+    return address
+
+
+class StunProtocol(asyncio.DatagramProtocol):
+    """Datagram protocol that resolves a future with the first STUN response."""
+
+    def __init__(self) -> None:
+        """
+        Initialize the protocol with a pending response future.
+        """
+        self.response: asyncio.Future = asyncio.get_running_loop().create_future()
+
+    def datagram_received(self, data: bytes, addr: Tuple[str, int]) -> None:
+        """
+        Resolve the response future with the received datagram.
+
+        :param bytes data: The received data.
+        :param Tuple[str, int] addr: The address of the sender.
+        """
+        if not self.response.done():
+            self.response.set_result(data)
+
+    def error_received(self, exc: Exception) -> None:
+        """
+        Propagate socket errors to the awaiting caller.
+
+        :param Exception exc: The error raised by the transport.
+        """
+        if not self.response.done():
+            self.response.set_exception(exc)
+
+
+def build_binding_request(transaction_id: bytes) -> bytes:
+    """
+    Build a 20-byte STUN Binding Request.
+
+    :param bytes transaction_id: The 12-byte random transaction ID.
+    :return bytes: The encoded request.
+    """
+    return struct.pack(">HHI12s", BINDING_REQUEST, 0, MAGIC_COOKIE, transaction_id)
+
+
+def parse_binding_response(data: bytes, transaction_id: bytes) -> Tuple[str, int]:
+    """
+    Extract the mapped public address from a STUN Binding Response.
+
+    Walks the attribute TLVs looking for XOR-MAPPED-ADDRESS (falling back
+    to the legacy MAPPED-ADDRESS) and un-XORs it with the magic cookie.
+
+    :param bytes data: The raw response datagram.
+    :param bytes transaction_id: The transaction ID the request was sent with.
+    :return Tuple[str, int]: The public (IP, port) seen by the STUN server.
+    """
+    if len(data) < 20:
+        raise ValueError("STUN response too short")
+    msg_type, length, _, tid = struct.unpack(">HHI12s", data[:20])
+    if msg_type != BINDING_RESPONSE or tid != transaction_id:
+        raise ValueError("Unexpected STUN response")
+    offset = 20
+    end = min(len(data), 20 + length)
+    while offset + 4 <= end:
+        attr_type, attr_len = struct.unpack(">HH", data[offset : offset + 4])
+        value = data[offset + 4 : offset + 4 + attr_len]
+        if attr_type == XOR_MAPPED_ADDRESS and len(value) >= 8:
+            port = struct.unpack(">H", value[2:4])[0] ^ (MAGIC_COOKIE >> 16)
+            raw_ip = struct.unpack(">I", value[4:8])[0] ^ MAGIC_COOKIE
+            return ".".join(str((raw_ip >> shift) & 0xFF) for shift in (24, 16, 8, 0)), port
+        if attr_type == MAPPED_ADDRESS and len(value) >= 8:
+            return ".".join(str(b) for b in value[4:8]), struct.unpack(">H", value[2:4])[0]
+        offset += 4 + attr_len + (-attr_len % 4)  # Attributes are padded to 4 bytes
+    raise ValueError("No mapped address in STUN response")
+
+
+async def run_binding_transaction(
+    sendto: Callable[[bytes, Tuple[str, int]], None],
+    response: "asyncio.Future[bytes]",
+    transaction_id: bytes,
+    addr: Tuple[str, int],
+    timeout: float = 2.0,
+) -> Tuple[str, int]:
+    """
+    Drive one Binding transaction over an already-bound socket.
+
+    Retransmits the request every RETRANSMIT_INTERVAL until the response
+    future resolves or the deadline passes. The caller owns the socket
+    and the future, so the same loop serves both the standalone endpoint
+    in get_public_address and rediscovery over the live P2P socket.
+
+    :param Callable[[bytes, Tuple[str, int]], None] sendto: Sends a datagram on the caller's socket.
+    :param asyncio.Future response: Resolved with the raw response datagram.
+    :param bytes transaction_id: The 12-byte random transaction ID.
+    :param Tuple[str, int] addr: The resolved STUN server (IP, port).
+    :param float timeout: Seconds to wait for the response.
+    :return Tuple[str, int]: The public (IP, port) of this client.
+    """
+    loop = asyncio.get_running_loop()
+    request = build_binding_request(transaction_id)
+    deadline = loop.time() + timeout
+    while True:
+        sendto(request, addr)
+        remaining = deadline - loop.time()
+        if remaining <= 0:
+            raise asyncio.TimeoutError(f"No STUN response from {addr[0]}:{addr[1]}")
+        try:
+            data = await asyncio.wait_for(
+                asyncio.shield(response), timeout=min(RETRANSMIT_INTERVAL, remaining)
+            )
+            return parse_binding_response(data, transaction_id)
+        except asyncio.TimeoutError:
+            if loop.time() >= deadline:
+                raise
+
+
+async def get_public_address(
+    stun_host: str, stun_port: int, source_port: int = 0, timeout: float = 2.0
+) -> Tuple[str, int]:
+    """
+    Discover the public (IP, port) mapping via a STUN Binding transaction.
+
+    Runs entirely on the event loop: one ~20-byte request, one response,
+    no executor thread. The endpoint binds to `source_port` so the
+    discovered mapping matches the port the hole-punching socket will
+    use; it must therefore only run while that socket is down (a live
+    socket queries through run_binding_transaction instead, since two
+    sockets on one port would split inbound datagrams between them).
+
+    :param str stun_host: The STUN server hostname or IP.
+    :param int stun_port: The STUN server port.
+    :param int source_port: The local port to bind (0 for ephemeral).
+    :param float timeout: Seconds to wait for the response.
+    :return Tuple[str, int]: The public (IP, port) of this client.
+    """
+    loop = asyncio.get_running_loop()
+    protocol = StunProtocol()
+    transaction_id = os.urandom(12)
+    transport, _ = await loop.create_datagram_endpoint(lambda: protocol, local_addr=("0.0.0.0", source_port))
+    try:
+        server_ip = await resolve_stun_host(stun_host, stun_port)
+        return await run_binding_transaction(
+            transport.sendto, protocol.response, transaction_id, (server_ip, stun_port), timeout
+        )
+    finally:
+        transport.close()
@@ -1,22 +1,27 @@
 import asyncio
-from socket import AF_INET, SOCK_DGRAM, socket
-from typing import Callable, Optional, Tuple
+from socket import SO_RCVBUF, SO_SNDBUF, SOL_SOCKET
+from typing import Callable, List, Optional, Tuple, Union
+
+from fungi.client import mmsg
 
 
 class UDPServer(asyncio.DatagramProtocol):
     """A UDP server for handling P2P communications."""
 
-    def __init__(self, message_handler: Callable[[str, Tuple[str, int]], None]) -> None:
+    # Kernel buffer size requested for the bound socket. Larger buffers
+    # absorb punch/pong bursts that would otherwise be dropped.
+    SOCKET_BUFFER_SIZE: int = 4 << 20
+
+    def __init__(self, message_handler: Callable[[bytes, Tuple[str, int]], None]) -> None:
         """
         Initialize the UDP server.
 
-        :param Callable[[str, Tuple[str, int]], None] message_handler: Callback function to handle received messages.
+        :param Callable[[bytes, Tuple[str, int]], None] message_handler: Callback function to handle received datagrams.
         """
         super().__init__()
-        self._send_socket = socket(AF_INET, SOCK_DGRAM)
         self._transport: Optional[asyncio.DatagramTransport] = None
+        self._sock = None
         self._message_handler = message_handler
-        self.connection_callback: Optional[Callable[[], None]] = None
 
     def connection_made(self, transport: asyncio.DatagramTransport) -> None:
         """
@@ -25,34 +30,76 @@ class UDPServer(asyncio.DatagramProtocol):
         :param asyncio.DatagramTransport transport: The transport representing the connection.
         """
         self._transport = transport
+        self._sock = transport.get_extra_info("socket")
 
     def datagram_received(self, data: bytes, addr: Tuple[str, int]) -> None:
         """
         Called when a datagram is received.
 
+        The raw bytes are handed to the handler untouched; decoding (and
+        its per-byte UTF-8 scan) is left to whoever actually needs text.
+
         :param bytes data: The received data.
         :param Tuple[str, int] addr: The address of the sender.
         """
-        message = data.decode()
-        self._message_handler(message, addr)
+        self._message_handler(data, addr)
 
-    def send_message(self, message: str, target_ip: str, target_port: int) -> None:
+    def send_message(self, message: Union[str, bytes], addr: Tuple[str, int]) -> None:
         """
         Send a message to a specified target.
 
-        :param str message: The message to send.
-        :param str target_ip: The target IP address.
-        :param int target_port: The target port number.
+        Callers that already hold encoded bytes pass them through without
+        a second encode or copy.
+
+        :param Union[str, bytes] message: The message to send.
+        :param Tuple[str, int] addr: The target (IP, port) address.
+        """
+        payload = message if isinstance(message, bytes) else message.encode()
+        self.sendto(payload, addr)
+
+    def sendto(self, payload: bytes, addr: Tuple[str, int]) -> None:
         """
-        self._send_socket.sendto(message.encode(), (target_ip, target_port))
+        Send pre-encoded bytes to a target address.
+
+        The datagram is first tried directly on the non-blocking socket,
+        skipping the transport's internal buffer copy; only if the kernel
+        would block does it fall back to the transport, which queues the
+        payload and flushes it with the event loop.
 
-    def set_connection_callback(self, callback: Optional[Callable[[], None]]) -> None:
+        :param bytes payload: The raw datagram payload.
+        :param Tuple[str, int] addr: The target (IP, port) address.
         """
-        Set the callback function for successful connections.
+        if self._transport is None:
+            raise RuntimeError("UDP server is not running")
+        if self._sock is not None:
+            try:
+                self._sock.sendto(payload, addr)
+                return
+            except (BlockingIOError, InterruptedError):
+                pass
+        self._transport.sendto(payload, addr)
+
+    def send_many(self, messages: List[Tuple[bytes, Tuple[str, int]]]) -> None:
+        """
+        Send a burst of datagrams, batching the syscalls where possible.
+
+        On Linux the whole burst goes through sendmmsg(2) in batches of
+        mmsg.BATCH_SIZE; elsewhere it falls back to one sendto per packet.
 
-        :param Optional[Callable[[], None]] callback: The callback function to handle successful connections.
+        :param List[Tuple[bytes, Tuple[str, int]]] messages: (payload, (ip, port)) pairs to send.
         """
-        self.connection_callback = callback
+        if self._transport is None:
+            raise RuntimeError("UDP server is not running")
+        if mmsg.available():
+            sock = self._transport.get_extra_info("socket")
+            if sock is not None:
+                try:
+                    mmsg.sendmmsg(sock.fileno(), messages)
+                    return
+                except OSError:
+                    pass
+        for payload, addr in messages:
+            self._transport.sendto(payload, addr)
 
     async def start(self, ip: str, port: int) -> None:
         """
@@ -62,7 +109,15 @@ class UDPServer(asyncio.DatagramProtocol):
         :param int port: The port number to bind to.
         """
         loop = asyncio.get_running_loop()
-        await loop.create_datagram_endpoint(lambda: self, local_addr=(ip, port))
+        transport, _ = await loop.create_datagram_endpoint(lambda: self, local_addr=(ip, port))
+        sock = transport.get_extra_info("socket")
+        if sock is not None:
+            try:
+                sock.setsockopt(SOL_SOCKET, SO_SNDBUF, self.SOCKET_BUFFER_SIZE)
+                sock.setsockopt(SOL_SOCKET, SO_RCVBUF, self.SOCKET_BUFFER_SIZE)
+            except OSError:
+                # Keep the kernel defaults if the platform refuses the size.
+                pass
 
     async def stop(self) -> None:
         """
@@ -71,7 +126,6 @@ class UDPServer(asyncio.DatagramProtocol):
         if self._transport:
             self._transport.close()
             self._transport = None
-        if self._send_socket:
-            self._send_socket.close()
+            self._sock = None
         # Wait a short time to ensure the socket is fully closed
         await asyncio.sleep(0.1)
@@ -1,60 +1,58 @@
-from typing import Optional
+from typing import List, Optional, Tuple
 
-from pydantic import BaseModel, Field, IPvAnyAddress
+from pydantic import BaseModel, ConfigDict, Field, IPvAnyAddress
 
 
 class Node(BaseModel):
     """
     Represents a node in the P2P network.
-    """
-
-    local_ip: IPvAnyAddress = Field(default="127.0.0.1", description="Local IP address of the node")
-    local_port: int = Field(default=0, description="Local port of the node")
-    public_ip: Optional[IPvAnyAddress] = Field(default=None, description="Public IP address of the node")
-    public_port: Optional[int] = Field(default=None, description="Public port of the node")
 
-    class Config:
-        """
-        Pydantic configuration for the Node model.
-        """
+    Nodes are immutable: addressing changes go through model_copy with an
+    update dict, which keeps instances safely hashable and lets caches key
+    on them without defensive copies.
+    """
 
-        arbitrary_types_allowed = True
-        json_schema_extra = {
+    model_config = ConfigDict(
+        arbitrary_types_allowed=True,
+        frozen=True,
+        json_schema_extra={
             "example": {
                 "local_ip": "192.168.1.100",
                 "local_port": 8000,
                 "public_ip": "203.0.113.1",
                 "public_port": 9000,
             }
-        }
+        },
+    )
 
-    def __str__(self) -> str:
-        """
-        String representation of the Node.
+    local_ip: IPvAnyAddress = Field(default="127.0.0.1", description="Local IP address of the node")
+    local_port: int = Field(default=0, description="Local port of the node")
+    public_ip: Optional[IPvAnyAddress] = Field(default=None, description="Public IP address of the node")
+    public_port: Optional[int] = Field(default=None, description="Public port of the node")
 
-        :return: A string representation of the Node.
+    def candidates(self) -> List[Tuple[str, int]]:
         """
-        return f"Node(public_ip={self.public_ip}, public_port={self.public_port})"
+        Get the candidate (IP, port) addresses for reaching this node.
 
-    def __eq__(self, other: object) -> bool:
-        """
-        Check if two Node objects are equal.
+        ICE-style ordering: the public NAT mapping first, then the local
+        address for the case where both peers share a LAN. Only complete
+        address pairs are returned.
 
-        :param other: The other object to compare with.
-        :return: True if the objects are equal, False otherwise.
+        :return List[Tuple[str, int]]: The candidate addresses to probe.
         """
-        if not isinstance(other, Node):
-            return False
-        same_public_ip = str(self.public_ip) == str(other.public_ip)
-        same_public_port = self.public_port == other.public_port
-        same_local_ip = str(self.local_ip) == str(other.local_ip)
-        same_local_port = self.local_port == other.local_port
-        return same_public_ip and same_public_port and same_local_ip and same_local_port
-
-    def __hash__(self) -> int:
+        candidates: List[Tuple[str, int]] = []
+        if self.public_ip is not None and self.public_port is not None:
+            candidates.append((str(self.public_ip), self.public_port))
+        if self.local_port:
+            local = (str(self.local_ip), self.local_port)
+            if local not in candidates:
+                candidates.append(local)
+        return candidates
+
+    def __str__(self) -> str:
         """
-        Generate a hash value for the Node.
+        String representation of the Node.
 
-        :return: The hash value of the Node.
+        :return: A string representation of the Node.
         """
-        return hash((self.public_ip, self.public_port, self.local_ip, self.local_port))
+        return f"Node(public_ip={self.public_ip}, public_port={self.public_port})"
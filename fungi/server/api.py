@@ -1,22 +1,45 @@
+import hashlib
 import json
-from typing import Dict, List
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, List, Literal
 
-from fastapi import FastAPI, HTTPException, Query
+from fastapi import Depends, FastAPI, Query, Request, Response
+from fastapi.responses import ORJSONResponse
 from node import Node
-from pydantic import IPvAnyAddress, ValidationError
+from pydantic import BaseModel, IPvAnyAddress
 from service import NetworkService
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    """Create the network service once the event loop exists and close it on shutdown"""
+    app.state.network_service = NetworkService()
+    yield
+    await app.state.network_service.aclose()
+
 app = FastAPI(
     title="P2P Network API",
     description="API for managing nodes in a P2P network",
     version="1.0.0",
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan,
     contact={
         "name": "Victor Goubet",
         "email": "victorgoubet@orange.fr",
     },
 )
 
-network_service = NetworkService()
+
+def get_network_service(request: Request) -> NetworkService:
+    """Dependency returning the service built at startup"""
+    return request.app.state.network_service
+
+
+class BatchOperation(BaseModel):
+    """A single node operation within a batch request"""
+
+    op: Literal["add", "remove", "update"]
+    node: Node
 
 
 @app.get(
@@ -37,20 +60,34 @@ network_service = NetworkService()
         }
     },
 )
-async def get_nodes() -> List[Node]:
-    """Get the list of nodes in the network"""
-    return await network_service.list_nodes()
+async def get_nodes(request: Request, network_service: NetworkService = Depends(get_network_service)) -> Response:
+    """Get the list of nodes in the network, honoring If-None-Match"""
+    nodes = await network_service.list_nodes()
+    payload = [node.model_dump(mode="json") for node in nodes]
+    etag = f'"{hashlib.md5(json.dumps(payload, sort_keys=True).encode()).hexdigest()}"'
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers={"ETag": etag})
+    return ORJSONResponse(content=payload, headers={"ETag": etag})
 
 
 @app.post(
     "/nodes",
     tags=["nodes"],
-    response_model=Node,
     status_code=201,
     responses={
         201: {
-            "description": "The added node",
-            "content": {"application/json": {"example": {"public_ip": "192.168.1.1", "public_port": 8080}}},
+            "description": "The added node together with the current node list",
+            "content": {
+                "application/json": {
+                    "example": {
+                        "node": {"public_ip": "192.168.1.1", "public_port": 8080},
+                        "nodes": [
+                            {"public_ip": "192.168.1.1", "public_port": 8080},
+                            {"public_ip": "192.168.1.2", "public_port": 9090},
+                        ],
+                    }
+                }
+            },
         },
         400: {
             "description": "Invalid request data",
@@ -58,13 +95,11 @@ async def get_nodes() -> List[Node]:
         },
     },
 )
-async def add_node(node: Node) -> Node:
-    """Add a new node to the network"""
-    try:
-        await network_service.add_node(node)
-        return node
-    except (ValidationError, json.JSONDecodeError) as e:
-        raise HTTPException(status_code=400, detail=str(e))
+async def add_node(node: Node, network_service: NetworkService = Depends(get_network_service)) -> Dict[str, Any]:
+    """Add a new node to the network and return the current node list"""
+    await network_service.add_node(node)
+    nodes = await network_service.list_nodes()
+    return {"node": node, "nodes": nodes}
 
 
 @app.delete(
@@ -81,13 +116,14 @@ async def add_node(node: Node) -> Node:
         },
     },
 )
-async def remove_node(public_ip: IPvAnyAddress = Query(...), public_port: int = Query(...)) -> None:
+async def remove_node(
+    public_ip: IPvAnyAddress = Query(...),
+    public_port: int = Query(...),
+    network_service: NetworkService = Depends(get_network_service),
+) -> None:
     """Remove a node from the network"""
     node = Node(public_ip=public_ip, public_port=public_port)
-    try:
-        await network_service.remove_node(node)
-    except (ValidationError, json.JSONDecodeError) as e:
-        raise HTTPException(status_code=400, detail=str(e))
+    await network_service.remove_node(node)
 
 
 @app.put(
@@ -105,10 +141,47 @@ async def remove_node(public_ip: IPvAnyAddress = Query(...), public_port: int =
         },
     },
 )
-async def update_node(node: Node) -> Dict[str, str]:
+async def update_node(node: Node, network_service: NetworkService = Depends(get_network_service)) -> Dict[str, str]:
     """Update node information"""
-    try:
-        await network_service.update_node(node)
-        return {"message": "Node information updated"}
-    except (ValidationError, json.JSONDecodeError) as e:
-        raise HTTPException(status_code=400, detail=str(e))
+    await network_service.update_node(node)
+    return {"message": "Node information updated"}
+
+
+@app.post(
+    "/nodes/batch",
+    tags=["nodes"],
+    status_code=200,
+    responses={
+        200: {
+            "description": "The operations were applied; returns the current node list",
+            "content": {
+                "application/json": {
+                    "example": {
+                        "applied": 2,
+                        "nodes": [
+                            {"public_ip": "192.168.1.1", "public_port": 8080},
+                            {"public_ip": "192.168.1.2", "public_port": 9090},
+                        ],
+                    }
+                }
+            },
+        },
+        400: {
+            "description": "Invalid request data",
+            "content": {"application/json": {"example": {"detail": "Invalid request data"}}},
+        },
+    },
+)
+async def batch_nodes(
+    operations: List[BatchOperation], network_service: NetworkService = Depends(get_network_service)
+) -> Dict[str, Any]:
+    """Apply several node operations in one round trip and return the node list"""
+    for operation in operations:
+        if operation.op == "add":
+            await network_service.add_node(operation.node)
+        elif operation.op == "remove":
+            await network_service.remove_node(operation.node)
+        else:
+            await network_service.update_node(operation.node)
+    nodes = await network_service.list_nodes()
+    return {"applied": len(operations), "nodes": nodes}
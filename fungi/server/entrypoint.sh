@@ -2,5 +2,5 @@
 # Start Redis server in the background
 redis-server --daemonize yes
 
-# Start the FastAPI application
-uvicorn api:app --host $UVICORN_HOST --port $UVICORN_PORT --reload
+# Start the FastAPI application on the uvloop/httptools stack
+uvicorn api:app --host $UVICORN_HOST --port $UVICORN_PORT --loop uvloop --http httptools
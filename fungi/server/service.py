@@ -1,11 +1,14 @@
 import asyncio
 import os
-from typing import Any, Awaitable, Dict, List
+from typing import List, Optional
 
-import redis
+import redis.asyncio as redis
 from node import Node
 from pydantic import BaseModel, Field, PrivateAttr
 
+# How many queued mutations may be folded into one Redis pipeline.
+WRITE_BATCH = 64
+
 
 class NetworkService(BaseModel):
     """Signaling server for managing P2P network nodes"""
@@ -15,14 +18,92 @@ class NetworkService(BaseModel):
     redis_db: int = Field(default=0, description="Redis database index")
     _redis_client: redis.Redis = PrivateAttr(default=None)
     _redis_key: str = PrivateAttr(default="p2p_nodes")
+    _nodes_cache: Optional[List[Node]] = PrivateAttr(default=None)
+    _watch_task: Optional[asyncio.Task] = PrivateAttr(default=None)
+    _write_queue: Optional[asyncio.Queue] = PrivateAttr(default=None)
+    _writer_task: Optional[asyncio.Task] = PrivateAttr(default=None)
 
     class Config:
         arbitrary_types_allowed = True
 
     def __init__(self, **data):
-        """Initialize the service"""
+        """Initialize the service with a bounded async connection pool"""
         super().__init__(**data)
-        self._redis_client = redis.Redis(host=self.redis_host, port=self.redis_port, db=self.redis_db)
+        pool = redis.BlockingConnectionPool(
+            host=self.redis_host, port=self.redis_port, db=self.redis_db, max_connections=32
+        )
+        self._redis_client = redis.Redis(connection_pool=pool)
+
+    async def _watch_invalidations(self) -> None:
+        """
+        Invalidate the in-process node cache on Redis keyspace events.
+
+        Keeps cached reads correct when several server replicas share one
+        Redis: any hash write by any replica drops this replica's snapshot.
+        Local writes invalidate directly, so a Redis without notifications
+        enabled still behaves correctly for a single server.
+        """
+        try:
+            await self._redis_client.config_set("notify-keyspace-events", "Kh")
+        except redis.RedisError:
+            pass
+        pubsub = self._redis_client.pubsub()
+        await pubsub.psubscribe(f"__keyspace@{self.redis_db}__:{self._redis_key}")
+        async for message in pubsub.listen():
+            if message.get("type") == "pmessage":
+                self._nodes_cache = None
+
+    def _ensure_writer(self) -> asyncio.Queue:
+        """
+        Get the mutation queue, starting the background writer on first use.
+
+        :return asyncio.Queue: The queue feeding the pipeline writer.
+        """
+        if self._write_queue is None:
+            self._write_queue = asyncio.Queue()
+            self._writer_task = asyncio.create_task(self._drain_writes())
+        return self._write_queue
+
+    async def _drain_writes(self) -> None:
+        """
+        Coalesce queued mutations into single Redis pipelines.
+
+        Waits for one mutation, then opportunistically drains whatever else
+        has queued up (bounded by WRITE_BATCH) into one pipeline, so burst
+        writes share a single round trip instead of paying one each.
+        """
+        while True:
+            batch = [await self._write_queue.get()]
+            while len(batch) < WRITE_BATCH:
+                try:
+                    batch.append(self._write_queue.get_nowait())
+                except asyncio.QueueEmpty:
+                    break
+            pipeline = self._redis_client.pipeline(transaction=False)
+            for command, args, _ in batch:
+                getattr(pipeline, command)(*args)
+            try:
+                await pipeline.execute()
+            except redis.RedisError as e:
+                for _, _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+            for _, _, future in batch:
+                if not future.done():
+                    future.set_result(None)
+
+    async def _submit_write(self, command: str, *args) -> None:
+        """
+        Queue a mutation for the pipeline writer and wait for its result.
+
+        :param str command: The Redis command name to run.
+        :param args: The command's arguments.
+        """
+        queue = self._ensure_writer()
+        future: asyncio.Future = asyncio.get_running_loop().create_future()
+        queue.put_nowait((command, args, future))
+        await future
 
     async def _add_node_to_storage(self, node: Node) -> None:
         """
@@ -32,7 +113,8 @@ class NetworkService(BaseModel):
         """
         node_key = f"{node.public_ip}:{node.public_port}"
         node_data = node.model_dump_json()
-        await asyncio.to_thread(self._redis_client.hset, self._redis_key, node_key, node_data)
+        await self._submit_write("hset", self._redis_key, node_key, node_data)
+        self._nodes_cache = None
 
     async def _remove_node_from_storage(self, node: Node) -> None:
         """
@@ -41,7 +123,8 @@ class NetworkService(BaseModel):
         :param Node node: The node to remove.
         """
         node_key = f"{node.public_ip}:{node.public_port}"
-        await asyncio.to_thread(self._redis_client.hdel, self._redis_key, node_key)
+        await self._submit_write("hdel", self._redis_key, node_key)
+        self._nodes_cache = None
 
     async def _load_nodes_from_storage(self) -> List[Node]:
         """
@@ -49,12 +132,8 @@ class NetworkService(BaseModel):
 
         :return List[Node]: A list of nodes currently in the network.
         """
-        nodes_data: Awaitable[dict[Any, Any]] | Dict[Any, Any] = await asyncio.to_thread(
-            self._redis_client.hgetall, self._redis_key
-        )
-        if isinstance(nodes_data, dict):
-            return [Node.model_validate_json(node_data) for node_data in nodes_data.values()]
-        return []
+        nodes_data = await self._redis_client.hgetall(self._redis_key)
+        return [Node.model_validate_json(node_data) for node_data in nodes_data.values()]
 
     async def add_node(self, node: Node) -> None:
         """
@@ -78,7 +157,11 @@ class NetworkService(BaseModel):
 
         :return List[Node]: A list of nodes currently in the network.
         """
-        return await self._load_nodes_from_storage()
+        if self._watch_task is None:
+            self._watch_task = asyncio.create_task(self._watch_invalidations())
+        if self._nodes_cache is None:
+            self._nodes_cache = await self._load_nodes_from_storage()
+        return list(self._nodes_cache)
 
     async def update_node(self, node: Node) -> None:
         """
@@ -87,3 +170,14 @@ class NetworkService(BaseModel):
         :param Node node: The node with updated information.
         """
         await self._add_node_to_storage(node)
+
+    async def aclose(self) -> None:
+        """
+        Stop background workers and release the Redis connection pool.
+        """
+        for task in (self._watch_task, self._writer_task):
+            if task is not None:
+                task.cancel()
+        self._watch_task = None
+        self._writer_task = None
+        await self._redis_client.aclose()
@@ -1,2 +1,9 @@
 SERVER_URL = "http://192.168.1.4:8000"
 STUN_SERVER = ("stun.l.google.com", 19302)
+
+# Queried concurrently during discovery; the first response wins.
+STUN_SERVERS = [
+    STUN_SERVER,
+    ("stun1.l.google.com", 19302),
+    ("stun2.l.google.com", 19302),
+]
@@ -1,12 +1,15 @@
 import logging
+from functools import lru_cache
 
 
+@lru_cache(maxsize=None)
 def get_logger(name: str = "P2PLogger", level: int = logging.INFO) -> logging.Logger:
     """
     Get a configured logger.
 
     This function creates and configures a logger with the specified name and logging level.
     If a logger with the given name already exists, it returns that logger instead of creating a new one.
+    Memoized per (name, level), so repeat callers skip the handler inspection entirely.
 
     :param name: Name of the logger. Defaults to "P2PLogger".
     :param level: Logging level. Defaults to logging.INFO.
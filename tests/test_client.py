@@ -0,0 +1,48 @@
+import asyncio
+
+import httpx
+
+from fungi.client import client as client_module
+from fungi.client.client import Client
+from fungi.models.node import Node
+
+NODE_PAYLOAD = [{"local_ip": "127.0.0.1", "local_port": 0, "public_ip": "5.6.7.8", "public_port": 9000}]
+
+
+def test_get_nodes_serves_cache_on_304(monkeypatch):
+    """A 304 on the conditional GET must return the cached list, not fail."""
+    requests_seen = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests_seen.append(request)
+        if request.headers.get("If-None-Match") == '"abc"':
+            return httpx.Response(304, headers={"ETag": '"abc"'})
+        return httpx.Response(200, json=NODE_PAYLOAD, headers={"ETag": '"abc"'})
+
+    async def run():
+        client = Client()
+        http = httpx.AsyncClient(base_url="http://testserver", transport=httpx.MockTransport(handler))
+        monkeypatch.setattr(client_module, "get_http", lambda url: http)
+        try:
+            first = await client.get_nodes()
+            second = await client.get_nodes()
+        finally:
+            await http.aclose()
+        return first, second
+
+    first, second = asyncio.run(run())
+    assert len(requests_seen) == 2
+    assert requests_seen[1].headers.get("If-None-Match") == '"abc"'
+    assert [str(node.public_ip) for node in first] == ["5.6.7.8"]
+    assert second == first
+
+
+def test_node_payload_follows_mapping_change():
+    """A copied node must re-serialize; no stale payload may survive the copy."""
+    client = Client()
+    client._node = Node(public_ip="1.2.3.4", public_port=1111)
+    assert client._node_payload()["public_port"] == 1111
+
+    client._node = client._node.model_copy(update={"public_ip": "1.2.3.4", "public_port": 2222})
+    client._invalidate_node_caches()
+    assert client._node_payload()["public_port"] == 2222